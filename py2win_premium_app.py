@@ -17,7 +17,15 @@ import webbrowser
 import tempfile
 import logging
 import html
+import re
+import codecs
+import signal
+import hashlib
+import sqlite3
 from pathlib import Path
+from collections import deque
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import filedialog, messagebox, Listbox
 from importlib import metadata
 from modulefinder import ModuleFinder
@@ -45,6 +53,164 @@ TOOLS_DIR = Path("./.tools")
 NSIS_DIR = TOOLS_DIR / "nsis"
 NSIS_URL = "https://prdownloads.sourceforge.net/nsis/nsis-3.09.zip?download"
 NSIS_EXE_PATH = NSIS_DIR / "nsis-3.09" / "makensis.exe"
+HISTORY_DB_PATH = TOOLS_DIR / "build_history.db"
+HISTORY_SECRET_KEYS = {"cert_pass"}  # Never hashed into the stored settings fingerprint
+SHARED_RUNTIME_DIRNAME = "_shared_runtime"
+DEDUP_MIN_SIZE = 64 * 1024  # Only binaries worth a hard link; tiny .pyc/.txt files are left alone
+DEDUP_CHUNK_SIZE = 1024 * 1024
+OUTPUT_CHUNK_SIZE = 64 * 1024  # Subprocess output is read in chunks, not line by line
+OUTPUT_MAX_LINE = 8192  # Longer lines are truncated so a runaway line can't grow the buffer
+OUTPUT_TAIL_LINES = 20  # Suppressed lines replayed when a process fails
+LOG_BACKLOG_LIMIT = 2000  # Pending GUI log records above which low-severity output is summarised instead of logged
+LOG_POLL_BATCH = 500  # Max log records inserted into the console per poll
+PIP_INSTALL_TIMEOUT = 1800
+NSIS_TIMEOUT = 900
+ERROR_LINE_RE = re.compile(r"\b(?:ERROR|CRITICAL|FATAL|Traceback|Error)\b|Exception:")
+WARNING_LINE_RE = re.compile(r"\b(?:WARNING|WARN|[Ww]arning)\b")
+PHASE_LINE_RE = re.compile(r"INFO: (?:PyInstaller:|Python:|Platform:|Building |Running Analysis|Analyzing |Processing module hooks|Looking for dynamic|Appending |Copying |Fixing |Checking |Build complete)"
+                           r"|^(?:Processing script file|Output:|Install: |Uninstall: |Total size:|Collecting |Installing collected|Successfully )")
+TRACE_TIMEOUT = 20  # Seconds a traced GUI app is left running before its trace is flushed
+STARTUP_PROBE_TIMEOUT = 30
+WATCH_POLL_INTERVAL = 0.5  # Seconds between stat sweeps in watch mode
+WATCH_DEBOUNCE = 0.8  # Quiet period after the last change before a rebuild starts
+# Never suggested for exclusion: PyInstaller's bootstrap needs these even if the trace misses them.
+TRACE_KEEP_MODULES = {"encodings", "codecs", "io", "abc", "os", "sys", "site", "importlib", "collections", "struct", "zipimport", "zlib", "marshal", "_frozen_importlib", "_frozen_importlib_external", "pyimod01_archive", "pyimod02_importers", "pyimod03_ctypes", "pyimod04_pywin32"}
+# Installed as sitecustomize.py in a temp dir on PYTHONPATH so it also hooks user-supplied test commands.
+TRACE_BOOTSTRAP = """
+import sys, os, json, atexit, threading
+# One file per process so a test command's child interpreters don't overwrite each other's traces.
+_out = os.path.join(os.environ["PY2WIN_TRACE_DIR"], f"trace-{os.getpid()}.json")
+_modules, _read, _written, _lock = set(), set(), set(), threading.Lock()
+_WRITE_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_CREAT | os.O_APPEND | os.O_TRUNC
+def _hook(event, args):
+    if event == "import": _modules.add(args[0])
+    elif event == "open" and isinstance(args[0], (str, bytes)):
+        mode, flags = args[1], args[2]
+        writes = any(c in mode for c in "wax+") if isinstance(mode, str) else bool(isinstance(flags, int) and flags & _WRITE_FLAGS)
+        (_written if writes else _read).add(os.path.abspath(os.fsdecode(args[0])))
+sys.addaudithook(_hook)
+def _dump():
+    with _lock:
+        data = {"modules": sorted(_modules | {k for k, v in list(sys.modules.items()) if v is not None}), "files": sorted(_read - _written)}
+        with open(_out, "w", encoding="utf-8") as f: json.dump(data, f)
+atexit.register(_dump)
+if float(os.environ.get("PY2WIN_TRACE_SECONDS", "0")) > 0:  # Script mode only: GUI main loops never exit on their own
+    def _stop(): _dump(); os._exit(0)
+    _timer = threading.Timer(float(os.environ["PY2WIN_TRACE_SECONDS"]), _stop); _timer.daemon = True; _timer.start()
+"""
+BYTECODE_CACHE_DIR = TOOLS_DIR / "bytecode_cache"
+BYTECODE_CACHE_MAX_BYTES = 1024 * 1024 * 1024  # LRU eviction trims the cache to 80% of this after each build
+# Shared by the PyInstaller bootstrap and the warm-up script; both run inside build_env so keys carry its magic number.
+BYTECODE_CACHE_COMMON = """
+import sys, os
+# These scripts run from the temp dir; drop it from sys.path so stray .py files there can't shadow or be bundled
+if sys.path and os.path.abspath(sys.path[0] or os.curdir) == os.path.dirname(os.path.abspath(__file__)): del sys.path[0]
+import time, marshal, hashlib, importlib.util, types
+def cache_root(base): return os.path.join(base, importlib.util.MAGIC_NUMBER.hex())
+def cache_key(source, optimize):
+    text = importlib.util.decode_source(source) if isinstance(source, bytes) else source
+    optimize = sys.flags.optimize if optimize == -1 else optimize
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass") + b"\\0%d" % optimize).hexdigest()
+def entry_path(root, key): return os.path.join(root, key[:2], key + ".bin")
+def store(path, code):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f: marshal.dump(code, f)
+    os.replace(tmp, path)
+def retarget(code, filename):
+    consts = tuple(retarget(c, filename) if isinstance(c, types.CodeType) else c for c in code.co_consts)
+    return code.replace(co_filename=filename, co_consts=consts)
+"""
+# Runs PyInstaller with modulegraph's and PyInstaller's compile() routed through the content-addressed cache.
+PYINSTALLER_CACHE_BOOTSTRAP = BYTECODE_CACHE_COMMON + """
+import ast, json, builtins
+root, stats_path, args = cache_root(sys.argv[1]), sys.argv[2], sys.argv[3:]
+stats = {"hits": 0, "ast_hits": 0, "misses": 0, "compile_seconds": 0.0}
+_compile, _pending = builtins.compile, {}
+def cached_compile(source, filename, mode, flags=0, dont_inherit=False, optimize=-1, **kwargs):
+    if mode != "exec" or kwargs or flags not in (0, ast.PyCF_ONLY_AST): return _compile(source, filename, mode, flags, dont_inherit, optimize, **kwargs)
+    if isinstance(source, (str, bytes)):
+        key = cache_key(source, optimize)
+        if flags:  # modulegraph parses first (it needs the AST), then compiles that AST; remember which source it came from
+            tree = _compile(source, filename, mode, flags, dont_inherit, optimize)
+            _pending[id(tree)] = (key, tree)
+            while len(_pending) > 256: _pending.pop(next(iter(_pending)))
+            return tree
+    else:
+        key, tree = _pending.pop(id(source), (None, None))
+        if tree is not source: return _compile(source, filename, mode, flags, dont_inherit, optimize)
+    path = entry_path(root, key)
+    try:
+        with open(path, "rb") as f: code = marshal.load(f)
+        os.utime(path)  # Keeps LRU eviction honest
+        stats["hits"] += 1
+        stats["ast_hits"] += isinstance(source, ast.AST)  # modulegraph already paid for the parse; only code generation was saved
+        return retarget(code, os.fsdecode(filename))
+    except (OSError, EOFError, ValueError, TypeError): pass
+    start = time.perf_counter()
+    code = _compile(source, filename, mode, flags, dont_inherit, optimize)
+    stats["compile_seconds"] += time.perf_counter() - start
+    stats["misses"] += 1
+    try: store(path, code)
+    except OSError: pass
+    return code
+def _write_stats():
+    with open(stats_path, "w", encoding="utf-8") as f: json.dump(stats, f)
+import atexit; atexit.register(_write_stats)
+try:
+    import PyInstaller.lib.modulegraph.modulegraph as _mg, PyInstaller.building.utils as _bu
+    _mg.compile = _bu.compile = cached_compile
+except Exception as e:
+    print(f"WARNING: bytecode cache disabled: {e}")
+from PyInstaller.__main__ import run
+run(args)
+"""
+# Fills a cold cache from build_env's stdlib and site-packages using a process pool.
+BYTECODE_CACHE_WARMER = BYTECODE_CACHE_COMMON + """
+import ast, json, sysconfig
+from concurrent.futures import ProcessPoolExecutor
+SKIP_DIRS = {"__pycache__", "test", "tests", "idlelib", "site-packages", "dist-packages"}
+def compile_one(item):
+    path, root = item
+    try:
+        with open(path, "rb") as f: text = importlib.util.decode_source(f.read())
+        target = entry_path(root, cache_key(text, -1))
+        if os.path.exists(target): return 0, 0.0, 0.0
+        start = time.perf_counter()
+        tree = compile(text, path, "exec", ast.PyCF_ONLY_AST, True)
+        parsed = time.perf_counter()
+        code = compile(tree, path, "exec", 0, True)
+        end = time.perf_counter()
+        store(target, code)
+        return 1, end - start, end - parsed
+    except Exception:
+        return 0, 0.0, 0.0
+if __name__ == "__main__":
+    root = cache_root(sys.argv[1])
+    paths = {n: sysconfig.get_path(n) for n in ("stdlib", "purelib", "platlib")}
+    state = {p: os.stat(p).st_mtime for p in set(paths.values()) if p and os.path.isdir(p)}
+    marker = os.path.join(root, "warm.json")
+    try:
+        with open(marker, encoding="utf-8") as f: previous = json.load(f)
+    except (OSError, ValueError): previous = {}
+    if previous.get("roots") == state:
+        print(json.dumps({"skipped": True, "per_file_seconds": previous.get("per_file_seconds", 0.0), "codegen_seconds": previous.get("codegen_seconds", 0.0)})); sys.exit(0)
+    files = []
+    for top in state:
+        for dirpath, dirnames, filenames in os.walk(top):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]  # purelib/platlib are walked as roots of their own
+            files += [os.path.join(dirpath, n) for n in filenames if n.endswith(".py")]
+    start = time.perf_counter()
+    with ProcessPoolExecutor() as pool:
+        results = list(pool.map(compile_one, [(f, root) for f in files], chunksize=64))
+    compiled, seconds, codegen = sum(r[0] for r in results), sum(r[1] for r in results), sum(r[2] for r in results)
+    per_file = seconds / compiled if compiled else previous.get("per_file_seconds", 0.0)
+    per_codegen = codegen / compiled if compiled else previous.get("codegen_seconds", 0.0)
+    os.makedirs(root, exist_ok=True)
+    with open(marker, "w", encoding="utf-8") as f: json.dump({"roots": state, "per_file_seconds": per_file, "codegen_seconds": per_codegen}, f)
+    print(json.dumps({"files": len(files), "compiled": compiled, "compile_seconds": seconds, "wall_seconds": time.perf_counter() - start,
+                      "per_file_seconds": per_file, "codegen_seconds": per_codegen}))
+"""
 REQUIRED_PACKAGES = ["pip", "wheel", "setuptools", "pyinstaller", "pynsist", "pillow", "requests", "cryptography", "pefile", "pipdeptree"]
 
 # --- Logging Setup ---
@@ -55,6 +221,8 @@ class QueueHandler(logging.Handler):
         self.log_queue = log_queue
     def emit(self, record):
         self.log_queue.put(self.format(record))
+    def backlog(self):
+        return self.log_queue.qsize()
 
 class Tooltip:
     def __init__(self, widget, text):
@@ -72,11 +240,214 @@ class Tooltip:
         self.tooltip_window = None
 
 # --- CORE LOGIC CLASSES ---
-class EnvManager:
+class ProcessRunner:
+    """Runs a subprocess with chunked, classified output that backs off when the UI lags, a timeout, tree kill and resource accounting."""
     def __init__(self, logger):
         self.logger = logger
-        self.python_executable = VENV_DIR / ("Scripts/python.exe" if sys.platform == "win32" else "bin/python")
-        self.pip_executable = VENV_DIR / ("Scripts/pip.exe" if sys.platform == "win32" else "bin/pip")
+        self.process = None
+        self.killed = False
+        self._finished = True
+        self._queue_handlers = [h for h in logger.handlers if isinstance(h, QueueHandler)]
+
+    def _backlogged(self):
+        return any(h.backlog() > LOG_BACKLOG_LIMIT for h in self._queue_handlers)
+
+    def kill(self):
+        """Kills the process and all of its children (e.g. the python.exe behind a console-script launcher)."""
+        self.killed = True  # Also honoured by run() if the kill arrives before the process has started
+        process = self.process
+        if not process or self._finished: return
+        try:
+            if sys.platform == "win32":
+                subprocess.run(["taskkill", "/T", "/F", "/PID", str(process.pid)], capture_output=True, creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+            else:
+                os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            process.kill()
+
+    def run(self, cmd, timeout=None, escape=False, label="Process", **popen_kwargs):
+        start = time.perf_counter()
+        self._finished, timed_out = False, []
+        self.process = process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, start_new_session=(sys.platform != "win32"),
+                                                  creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0), **popen_kwargs)
+        if self.killed: self.kill()
+        watchdog = None
+        if timeout:
+            watchdog = threading.Timer(timeout, lambda: timed_out.append(True) or self.kill())
+            watchdog.daemon = True
+            watchdog.start()
+        stats = {"lines": 0, "suppressed": 0, "warnings": 0, "errors": 0}
+        tail = deque(maxlen=OUTPUT_TAIL_LINES)
+        try:
+            self._pump(process.stdout, escape, stats, tail)
+        finally:
+            if watchdog: watchdog.cancel()
+            returncode, cpu_time, peak_rss = self._wait(process)
+            self._finished = True
+            process.stdout.close()
+        if timed_out: self.logger.error("❌ %s timed out after %d seconds and was killed.", label, timeout)
+        if returncode != 0 and tail and not self.killed:
+            self.logger.info("Last suppressed output lines:")
+            for line in tail: self.logger.info("%s", html.escape(line) if escape else line)
+        result = dict(stats, returncode=returncode, timed_out=bool(timed_out), wall_time=time.perf_counter() - start, cpu_time=cpu_time, peak_rss=peak_rss)
+        self.logger.info("%s finished: exit %s, %.1f s wall, %s CPU, peak RSS %s, %d lines (%d suppressed, %d warnings, %d errors).",
+                         label, returncode, result['wall_time'], f"{cpu_time:.1f} s" if cpu_time is not None else "n/a",
+                         f"{peak_rss / 1e6:.0f} MB" if peak_rss is not None else "n/a", stats['lines'], stats['suppressed'], stats['warnings'], stats['errors'])
+        return result
+
+    def _pump(self, stream, escape, stats, tail):
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        fd, pending, suppressed = stream.fileno(), "", 0
+        while True:
+            chunk = os.read(fd, OUTPUT_CHUNK_SIZE)
+            lines = (pending + decoder.decode(chunk, final=not chunk)).split("\n")
+            pending = "" if not chunk else lines.pop()[-OUTPUT_MAX_LINE:]
+            for line in lines:
+                line = line.strip()[:OUTPUT_MAX_LINE]
+                if not line: continue
+                stats['lines'] += 1
+                if ERROR_LINE_RE.search(line): level = logging.ERROR; stats['errors'] += 1
+                elif WARNING_LINE_RE.search(line): level = logging.WARNING; stats['warnings'] += 1
+                elif PHASE_LINE_RE.search(line): level = logging.INFO
+                else:
+                    level = None
+                    if self._backlogged():  # Only shed output while the UI is behind; otherwise every line is logged
+                        suppressed += 1; stats['suppressed'] += 1; tail.append(line)
+                        continue
+                if suppressed:
+                    self.logger.info("… %d low-severity lines suppressed.", suppressed); suppressed = 0
+                self.logger.log(level or logging.INFO, "%s", html.escape(line) if escape else line)
+            if not chunk: break
+        if suppressed: self.logger.info("… %d low-severity lines suppressed.", suppressed)
+
+    def _wait(self, process):
+        """Reaps the process, returning (returncode, cpu_seconds, peak_rss_bytes); accounting is None where unavailable."""
+        if sys.platform == "win32":
+            return (process.wait(), *self._windows_usage(process))
+        try:
+            _, status, usage = os.wait4(process.pid, 0)
+        except ChildProcessError:
+            return process.wait(), None, None
+        process.returncode = os.waitstatus_to_exitcode(status)
+        return process.returncode, usage.ru_utime + usage.ru_stime, usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+    @staticmethod
+    def _windows_usage(process):
+        try:
+            import ctypes
+            from ctypes import wintypes
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [(n, ctypes.c_size_t) for n in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+            handle = wintypes.HANDLE(int(process._handle))
+            times = [wintypes.FILETIME() for _ in range(4)]  # creation, exit, kernel, user
+            ctypes.windll.kernel32.GetProcessTimes(handle, *[ctypes.byref(t) for t in times])
+            cpu = sum((t.dwHighDateTime << 32 | t.dwLowDateTime) for t in times[2:]) / 1e7
+            counters = PROCESS_MEMORY_COUNTERS(cb=ctypes.sizeof(PROCESS_MEMORY_COUNTERS))
+            ctypes.windll.kernel32.K32GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb)
+            return cpu, counters.PeakWorkingSetSize
+        except Exception:
+            return None, None
+
+class BuildHistory:
+    """SQLite record of every executable and installer build: settings hash, phase timings, sizes and outcome."""
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS builds (
+        id INTEGER PRIMARY KEY, kind TEXT NOT NULL, name TEXT NOT NULL, settings_hash TEXT NOT NULL,
+        started_at REAL NOT NULL, duration REAL NOT NULL, artifact_size INTEGER, exit_status INTEGER,
+        success INTEGER NOT NULL, cpu_time REAL, peak_rss INTEGER);
+    CREATE TABLE IF NOT EXISTS build_phases (
+        build_id INTEGER NOT NULL REFERENCES builds(id) ON DELETE CASCADE, phase TEXT NOT NULL, seconds REAL NOT NULL);
+    CREATE INDEX IF NOT EXISTS idx_builds_started ON builds(started_at);
+    CREATE INDEX IF NOT EXISTS idx_builds_name_started ON builds(name, started_at);
+    CREATE INDEX IF NOT EXISTS idx_builds_duration ON builds(duration);
+    CREATE INDEX IF NOT EXISTS idx_builds_size ON builds(artifact_size);
+    CREATE INDEX IF NOT EXISTS idx_builds_settings ON builds(settings_hash);
+    CREATE INDEX IF NOT EXISTS idx_phases_build ON build_phases(build_id);
+    """
+    def __init__(self, logger=None, db_path=HISTORY_DB_PATH):
+        self.logger = logger
+        self.db_path = Path(db_path)
+
+    def _connect(self):
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(self.SCHEMA)
+        return conn
+
+    @staticmethod
+    def settings_hash(*settings):
+        merged = {k: v for d in settings for k, v in d.items() if k not in HISTORY_SECRET_KEYS}
+        return hashlib.sha256(json.dumps(merged, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def phase_clock():
+        """Returns (phases, mark); mark(name) adds the seconds since the previous mark to phases[name]."""
+        phases, last = {}, [time.perf_counter()]
+        def mark(name):
+            now = time.perf_counter()
+            phases[name] = phases.get(name, 0.0) + now - last[0]
+            last[0] = now
+        return phases, mark
+
+    def record(self, kind, name, settings_hash, started_at, duration, phases, artifact_size=None, exit_status=None, success=False, cpu_time=None, peak_rss=None):
+        try:
+            with closing(self._connect()) as conn, conn:
+                cur = conn.execute("INSERT INTO builds (kind, name, settings_hash, started_at, duration, artifact_size, exit_status, success, cpu_time, peak_rss) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                   (kind, name, settings_hash, started_at, duration, artifact_size, exit_status, int(success), cpu_time, peak_rss))
+                conn.executemany("INSERT INTO build_phases (build_id, phase, seconds) VALUES (?, ?, ?)", [(cur.lastrowid, k, v) for k, v in phases.items()])
+        except (sqlite3.Error, OSError) as e:
+            if self.logger: self.logger.warning(f"Could not record build history: {e}")
+
+    def trends(self, days=30):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT date(started_at, 'unixepoch', 'localtime') AS day, kind, COUNT(*), AVG(success) * 100, AVG(duration), AVG(artifact_size) "
+                                "FROM builds WHERE started_at >= ? GROUP BY day, kind ORDER BY day, kind", (time.time() - days * 86400,)).fetchall()
+
+    def top(self, column, limit=10):
+        if column not in ("duration", "artifact_size"): raise ValueError(f"Unsupported column: {column}")
+        with closing(self._connect()) as conn:
+            return conn.execute(f"SELECT started_at, kind, name, duration, artifact_size, success FROM builds WHERE {column} IS NOT NULL ORDER BY {column} DESC LIMIT ?", (limit,)).fetchall()
+
+    def report(self, days=30, limit=10):
+        lines = [f"Build trends (last {days} days):", f"{'Day':<12}{'Kind':<11}{'Builds':>7}{'OK %':>7}{'Avg (s)':>9}{'Avg (MB)':>10}"]
+        for day, kind, count, ok, duration, size in self.trends(days):
+            lines.append(f"{day:<12}{kind:<11}{count:>7}{ok:>7.0f}{duration:>9.1f}{(size or 0) / 1e6:>10.1f}")
+        for title, column in (("Slowest builds", "duration"), ("Largest artifacts", "artifact_size")):
+            lines += ["", f"{title}:", f"{'Started':<18}{'Kind':<11}{'Name':<24}{'Time (s)':>9}{'Size (MB)':>10}  Status"]
+            for started, kind, name, duration, size, success in self.top(column, limit):
+                when = time.strftime("%Y-%m-%d %H:%M", time.localtime(started))
+                lines.append(f"{when:<18}{kind:<11}{name[:23]:<24}{duration:>9.1f}{(size or 0) / 1e6:>10.1f}  {'ok' if success else 'failed'}")
+        return "\n".join(lines)
+
+class EnvManager:
+    def __init__(self, logger, base_python=sys.executable, venv_dir=VENV_DIR):
+        self.logger = logger
+        self.base_python = base_python
+        self.venv_dir = Path(venv_dir)
+        self.python_executable = self.venv_dir / ("Scripts/python.exe" if sys.platform == "win32" else "bin/python")
+        self.pip_executable = self.venv_dir / ("Scripts/pip.exe" if sys.platform == "win32" else "bin/pip")
+
+    @staticmethod
+    def discover_interpreters():
+        """Returns {(major, minor): path} for every CPython 3 found via the py launcher or PATH."""
+        candidates = [sys.executable] + [shutil.which(n) for n in ["python3", "python"] + [f"python3.{m}" for m in range(8, 16)]]
+        if sys.platform == "win32" and shutil.which("py"):
+            listing = subprocess.run(["py", "-0p"], capture_output=True, text=True, creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)).stdout
+            candidates += re.findall(r"^\s*-\S+\s+(?:\*\s+)?(.+?\.exe)\s*$", listing, re.MULTILINE | re.IGNORECASE)
+        found, seen = {}, set()
+        for candidate in filter(None, candidates):
+            resolved = os.path.realpath(candidate)
+            if resolved in seen: continue
+            seen.add(resolved)
+            try:
+                out = subprocess.run([candidate, "-c", "import sys; print(sys.implementation.name, *sys.version_info[:2])"], capture_output=True, text=True, timeout=15, creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)).stdout.split()
+            except (OSError, subprocess.TimeoutExpired): continue
+            if len(out) == 3 and out[0] == "cpython" and out[1] == "3":
+                found.setdefault((3, int(out[2])), candidate)
+        return dict(sorted(found.items()))
     def validate_environment(self, on_complete=None):
         self.logger.info("Starting environment validation...")
         thread = threading.Thread(target=self._validate_in_background, args=(on_complete,), daemon=True); thread.start(); return thread
@@ -88,11 +459,11 @@ class EnvManager:
         except Exception as e:
             self.logger.error(f"❌ Environment validation failed: {e}")
             if on_complete: on_complete(False)
-    def _check_venv(self): return VENV_DIR.is_dir() and self.python_executable.is_file()
+    def _check_venv(self): return self.venv_dir.is_dir() and self.python_executable.is_file()
     def _create_venv(self):
-        self.logger.info(f"Creating virtual environment in {VENV_DIR}...")
+        self.logger.info(f"Creating virtual environment in {self.venv_dir}...")
         try:
-            subprocess.run([sys.executable, "-m", "venv", str(VENV_DIR)], check=True, capture_output=True, text=True, creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+            subprocess.run([str(self.base_python), "-m", "venv", str(self.venv_dir)], check=True, capture_output=True, text=True, creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
             self.logger.info("Virtual environment created.")
         except subprocess.CalledProcessError as e: raise RuntimeError(f"Failed to create venv: {e.stderr}")
     def _check_and_install_packages(self):
@@ -104,23 +475,242 @@ class EnvManager:
             if missing:
                 self.logger.info(f"Installing missing/upgrading packages: {', '.join(missing)}")
                 cmd = [str(self.pip_executable), "install", "--upgrade"] + missing
-                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding='utf-8', creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
-                for line in iter(process.stdout.readline, ''): self.logger.info(line.strip())
-                if process.wait() != 0: raise RuntimeError("Failed to install packages.")
+                if ProcessRunner(self.logger).run(cmd, timeout=PIP_INSTALL_TIMEOUT, label="pip")['returncode'] != 0: raise RuntimeError("Failed to install packages.")
                 self.logger.info("All packages installed successfully.")
             else: self.logger.info("All required packages are already installed.")
         except (subprocess.CalledProcessError, FileNotFoundError) as e: raise RuntimeError(f"Failed to check/install packages: {e}")
 
+class BytecodeCache:
+    """Content-addressed code-object cache shared by every PyInstaller run in the same interpreter."""
+    def __init__(self, logger, cache_dir=BYTECODE_CACHE_DIR, max_bytes=BYTECODE_CACHE_MAX_BYTES):
+        self.logger = logger
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.per_file_seconds = 0.0
+        self.codegen_seconds = 0.0
+
+    def _run_script(self, env_manager, source, args):
+        fd, script = tempfile.mkstemp(prefix="py2win_bytecode_", suffix=".py")
+        with os.fdopen(fd, "w", encoding="utf-8") as f: f.write(source)
+        return script, [str(env_manager.python_executable), script, str(self.cache_dir.resolve())] + args
+
+    def warm(self, env_manager):
+        """Compiles build_env's stdlib and site-packages into the cache; a no-op unless they changed since the last warm."""
+        script, cmd = self._run_script(env_manager, BYTECODE_CACHE_WARMER, [])
+        try:
+            out = subprocess.run(cmd, capture_output=True, text=True, creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)).stdout.strip().splitlines()
+            info = json.loads(out[-1]) if out else {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Bytecode cache warm-up failed: {e}")
+            return
+        finally:
+            os.remove(script)
+        self.per_file_seconds = info.get("per_file_seconds", 0.0)
+        self.codegen_seconds = info.get("codegen_seconds", 0.0)
+        if not info.get("skipped") and info:
+            self.logger.info("🔥 Bytecode cache warmed: %d of %d modules compiled (%.1f s CPU in %.1f s wall).",
+                             info['compiled'], info['files'], info['compile_seconds'], info['wall_seconds'])
+
+    def wrap_command(self, env_manager, pyinstaller_args):
+        """Returns (cmd, temp_files) running PyInstaller through the caching bootstrap."""
+        fd, stats_path = tempfile.mkstemp(prefix="py2win_bytecode_stats_", suffix=".json")
+        os.close(fd)
+        script, cmd = self._run_script(env_manager, PYINSTALLER_CACHE_BOOTSTRAP, [stats_path] + list(pyinstaller_args))
+        return cmd, (script, stats_path)
+
+    def finish(self, temp_files):
+        script, stats_path = temp_files
+        try:
+            stats = json.loads(Path(stats_path).read_text(encoding="utf-8") or "{}")
+        except (OSError, ValueError):
+            stats = {}
+        finally:
+            for path in temp_files:
+                try: os.remove(path)
+                except OSError: pass
+        if stats.get("hits", 0) + stats.get("misses", 0):
+            self._report(stats)
+        try:
+            self.evict()
+        except OSError as e:
+            self.logger.warning(f"Bytecode cache eviction failed: {e}")
+
+    def _report(self, stats):
+        lookups = stats['hits'] + stats['misses']
+        # The warm-up's averages over thousands of modules are steadier per-module costs than this build's few misses.
+        # Hits on modulegraph's path still parsed the source, so they only saved the AST-to-code step.
+        per_miss = stats['compile_seconds'] / stats['misses'] if stats['misses'] else 0.0
+        ast_hits = stats.get('ast_hits', 0)
+        saved = ast_hits * (self.codegen_seconds or per_miss) + (stats['hits'] - ast_hits) * (self.per_file_seconds or per_miss)
+        totals_path = self.cache_dir / "stats.json"
+        try: totals = json.loads(totals_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError): totals = {"builds": 0, "hits": 0, "misses": 0, "compile_seconds": 0.0, "saved_seconds": 0.0}
+        for key, value in (("builds", 1), ("hits", stats['hits']), ("misses", stats['misses']), ("compile_seconds", stats['compile_seconds']), ("saved_seconds", saved)):
+            totals[key] += value
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            totals_path.write_text(json.dumps(totals), encoding="utf-8")
+        except OSError as e:
+            self.logger.warning(f"Could not update bytecode cache statistics: {e}")
+        self.logger.info("Bytecode cache: %d/%d hits (%.1f%%), %d compiled in %.1f s, ~%.1f s compile time saved. "
+                         "Across %d builds: %.1f%% hit rate, ~%.0f s saved.",
+                         stats['hits'], lookups, 100 * stats['hits'] / lookups, stats['misses'], stats['compile_seconds'], saved,
+                         totals['builds'], 100 * totals['hits'] / max(1, totals['hits'] + totals['misses']), totals['saved_seconds'])
+
+    def evict(self):
+        """Drops least-recently-used entries (hits refresh mtime) until the cache is under 80% of max_bytes."""
+        if not self.cache_dir.is_dir(): return
+        entries = []
+        for path in self.cache_dir.rglob("*.bin"):
+            try: st = path.stat()
+            except OSError: continue
+            entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes: return
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes * 0.8: break
+            try: path.unlink()
+            except OSError: continue
+            total -= size; removed += 1
+        self.logger.info("Bytecode cache evicted %d least-recently-used entries (%.0f MB kept).", removed, total / 1e6)
+
 class BuildOrchestrator:
-    def __init__(self, logger, env_manager):
+    def __init__(self, logger, env_manager, history=None):
         self.logger = logger
         self.env_manager = env_manager
+        self.history = history or BuildHistory(logger)
+        self._runner = None
+        self._cancel_event = None
+        self._watch_stop = None
 
     def build(self, project_settings, on_complete=None):
-        thread = threading.Thread(target=self._build_in_background, args=(project_settings, on_complete), daemon=True)
+        # Created here rather than in the thread so a cancel() right after build() can't be lost.
+        self._cancel_event = threading.Event()
+        thread = threading.Thread(target=self._build_in_background, args=(project_settings, on_complete, self._cancel_event), daemon=True)
         thread.start()
         return thread
 
+    def cancel(self):
+        """Stops the in-flight build: before PyInstaller starts, or by killing its process tree."""
+        if event := self._cancel_event:
+            event.set()
+        if runner := self._runner:
+            runner.kill()
+
+    @property
+    def is_watching(self):
+        return self._watch_stop is not None and not self._watch_stop.is_set()
+
+    def watch(self, project_settings, on_rebuilt=None):
+        """Polls the script, its local imports, data paths and icon, rebuilding incrementally after each save."""
+        self.stop_watch()
+        self._watch_stop = threading.Event()
+        thread = threading.Thread(target=self._watch_loop, args=(project_settings, self._watch_stop, on_rebuilt), daemon=True)
+        thread.start()
+        return thread
+
+    def stop_watch(self):
+        if self._watch_stop:
+            self._watch_stop.set()
+        self.cancel()
+
+    def _local_modules(self, script):
+        """The script plus every module it (transitively) imports from its own folder."""
+        root = Path(script).resolve().parent
+        seen, pending = set(), [Path(script).resolve()]
+        while pending:
+            path = pending.pop()
+            if path in seen: continue
+            seen.add(path)
+            try: tree = ast.parse(path.read_text(encoding='utf-8'))
+            except (OSError, SyntaxError, ValueError): continue
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Import): candidates = [(root, a.name) for a in node.names]
+                elif isinstance(node, ast.ImportFrom):
+                    base = path.parents[node.level - 1] if node.level else root
+                    prefix = f"{node.module}." if node.module else ""
+                    candidates = [(base, node.module)] if node.module else []
+                    candidates += [(base, prefix + a.name) for a in node.names]
+                else: continue
+                for base, name in candidates:
+                    module_path = base.joinpath(*name.split('.'))
+                    pending += [c for c in (module_path.with_suffix('.py'), module_path / '__init__.py') if c.is_file()]
+        return seen
+
+    def _watched_files(self, p_settings):
+        files = self._local_modules(p_settings['script_path'])
+        for p in p_settings.get('data_paths', []):
+            files |= {f for f in Path(p).rglob("*") if f.is_file()} if os.path.isdir(p) else {Path(p)}
+        if icon := p_settings.get('icon_path'): files.add(Path(icon))
+        return files
+
+    @staticmethod
+    def _snapshot(files):
+        snapshot = {}
+        for path in files:
+            try: st = os.stat(path)
+            except OSError: continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def _watch_loop(self, p_settings, stop, on_rebuilt=None):
+        settings = dict(p_settings, clean_build=False)  # Incremental: keep PyInstaller's work cache between rebuilds
+        files = self._watched_files(settings)
+        snapshot = self._snapshot(files)
+        self.logger.info("👀 Watching %d files for changes...", len(snapshot))
+        build_thread, generation = None, 0
+        while not stop.wait(WATCH_POLL_INTERVAL):
+            current = self._snapshot(files)
+            if current == snapshot: continue
+            # Debounce: editors often write a file several times per save.
+            while not stop.wait(WATCH_DEBOUNCE):
+                settled = self._snapshot(files)
+                if settled == current: break
+                current = settled
+            if stop.is_set(): break
+            changed = [p for p in current.keys() | snapshot.keys() if current.get(p) != snapshot.get(p)]
+            saved_at = max((current[p][0] / 1e9 for p in changed if p in current), default=time.time())
+            self.logger.info("Change detected in %s, rebuilding...", ", ".join(sorted(Path(p).name for p in changed)[:5]))
+            generation += 1  # Before cancelling, so the stale build's callback is ignored
+            if build_thread and build_thread.is_alive():
+                self.logger.info("Cancelling stale in-flight build.")
+                self.cancel()
+                build_thread.join()
+            def _on_complete(success, gen=generation, saved_at=saved_at):
+                if gen != generation or stop.is_set(): return  # Superseded by a newer save, or watch mode was stopped
+                if success: self.logger.info("⏱ Save-to-executable: %.2f seconds.", time.time() - saved_at)
+                if on_rebuilt: on_rebuilt(success)
+            build_thread = self.build(settings, _on_complete)
+            files = self._watched_files(settings)  # Imports or data folders may have changed
+            snapshot = self._snapshot(files)
+        self.logger.info("Watch mode stopped.")
+
+    @staticmethod
+    def artifact_path(p_settings):
+        exe_name = p_settings.get('exe_name', 'MyApp')
+        exe_file = f"{exe_name}.exe" if sys.platform == "win32" else exe_name
+        dist_path = Path(p_settings.get('output_dir', './dist'))
+        return dist_path / exe_file if p_settings.get('one_file', True) else dist_path / exe_name / exe_file
+
+    @staticmethod
+    def artifact_size(path):
+        path = Path(path)
+        if path.is_file(): return path.stat().st_size
+        return sum(p.stat().st_size for p in path.rglob("*") if p.is_file()) if path.is_dir() else 0
+
+    @staticmethod
+    def measure_startup(exe_path, timeout=STARTUP_PROBE_TIMEOUT):
+        """Seconds until the executable exits, or None if it is still running (e.g. a GUI main loop) at timeout."""
+        start = time.perf_counter()
+        process = subprocess.Popen([str(exe_path)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+        try:
+            process.wait(timeout=timeout)
+            return round(time.perf_counter() - start, 3)
+        except subprocess.TimeoutExpired:
+            process.kill(); process.wait()
+            return None
+
     def _create_version_file(self, p_settings):
         exe_name = p_settings.get('exe_name', 'MyApp')
         ver_info = {
@@ -150,31 +740,44 @@ VSVersionInfo(
         with os.fdopen(fd, "w", encoding="utf-8") as f: f.write(ver_file_content)
         return path
 
-    def _build_in_background(self, p_settings, on_complete=None):
+    def _build_in_background(self, p_settings, on_complete=None, cancel_event=None):
         if not p_settings.get('script_path') or not Path(p_settings.get('script_path')).exists():
             self.logger.error("❌ Build failed: Python script not specified or not found.")
             if on_complete: on_complete(False)
             return
+        if cancel_event is None:
+            cancel_event = self._cancel_event = threading.Event()
         start_time = time.time()
         success = False
         version_file = None
+        result = {}
+        bytecode_cache = cache_files = None
+        phases, mark = BuildHistory.phase_clock()
         try:
             pyinstaller_exe = self.env_manager.python_executable.parent / "pyinstaller"
             dist_path = Path(p_settings.get('output_dir', './dist'))
-            work_path = Path('./build')
+            work_path = Path(p_settings.get('work_dir', './build'))
             if p_settings.get('clean_build', True):
                 self.logger.info("🧹 Cleaning previous build files...")
-                if dist_path.exists(): shutil.rmtree(dist_path)
+                clean_path = dist_path
+                if p_settings.get('dedupe_binaries') and not p_settings.get('one_file', True):
+                    # Deduplication needs the sibling apps in the output folder, so only this app's own folder is cleaned.
+                    self.logger.warning("Clean Build with deduplication: keeping other apps in %s, removing only this app's previous output.", dist_path)
+                    clean_path = dist_path / p_settings.get('exe_name', 'MyApp')
+                if clean_path.exists(): shutil.rmtree(clean_path)
                 if work_path.exists(): shutil.rmtree(work_path)
                 self.logger.info("Clean complete.")
+                mark("clean")
             version_file = self._create_version_file(p_settings)
+            mark("prepare")
             cmd = [str(pyinstaller_exe), p_settings['script_path'], "--noconfirm", f"--version-file={version_file}"]
             cmd.extend(["--name", p_settings.get('exe_name', 'MyApp')])
             cmd.extend(["--distpath", str(dist_path)])
             cmd.extend(["--workpath", str(work_path)])
+            if spec_dir := p_settings.get('spec_dir'): cmd.extend(["--specpath", str(spec_dir)])
             if p_settings.get('one_file', True): cmd.append("--onefile")
             cmd.append("--windowed" if p_settings.get('windowed', True) else "--console")
-            if p := p_settings.get('icon_path'): cmd.extend(["--icon", str(p)])
+            if p := p_settings.get('icon_path'): cmd.extend(["--icon", os.path.abspath(p)])
             if p_settings.get('use_upx') and shutil.which("upx"): cmd.extend(["--upx-dir", str(Path(shutil.which("upx")).parent)])
             for hi in p_settings.get('hidden_imports', []): cmd.extend(["--hidden-import", hi])
             for ex in p_settings.get('exclude_modules', []): cmd.extend(["--exclude-module", ex])
@@ -182,24 +785,312 @@ VSVersionInfo(
                 sp = os.path.abspath(p)
                 dest = os.path.basename(sp) if os.path.isdir(sp) else "."
                 cmd.append(f"--add-data={sp}{(';' if os.name == 'nt' else ':')}{dest}")
+            if p_settings.get('bytecode_cache', True):
+                bytecode_cache = BytecodeCache(self.logger)
+                bytecode_cache.warm(self.env_manager)
+                mark("bytecode_warm")
+                cmd, cache_files = bytecode_cache.wrap_command(self.env_manager, cmd[1:])
             self.logger.info("Building with PyInstaller...")
             self.logger.info("Command: %s", ' '.join(cmd))  # Use string formatting to prevent log injection
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding='utf-8', creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
-            for line in iter(process.stdout.readline, ''):
-                self.logger.info(html.escape(line.strip()))
-            if process.wait() == 0:
+            self._runner = runner = ProcessRunner(self.logger)
+            if cancel_event.is_set():
+                self.logger.info("Build cancelled.")
+                return
+            result = runner.run(cmd, timeout=p_settings.get('build_timeout'), escape=True, label="PyInstaller")
+            mark("pyinstaller")
+            if result['returncode'] == 0:
                 duration = round(time.time() - start_time, 2)
                 success = True
                 self.logger.info(f"✅ Build successful in {duration} seconds.")
+                if p_settings.get('dedupe_binaries') and not p_settings.get('one_file', True):
+                    BinaryDeduplicator(self.logger).dedupe(dist_path)
+                    mark("dedupe")
+            elif cancel_event.is_set():
+                self.logger.info("Build cancelled.")
             else:
-                self.logger.error("❌ Build failed with exit code %d.", process.returncode)
+                self.logger.error("❌ Build failed with exit code %d.", result['returncode'])
         except Exception as e:
             self.logger.error(f"❌ An unexpected error occurred during build: {e}")
         finally:
+            self._runner = None
             if version_file and os.path.exists(version_file):
                 os.remove(version_file)
-            if on_complete:
-                on_complete(success)
+            try:  # Bookkeeping must never swallow the completion callback
+                if cache_files:
+                    bytecode_cache.finish(cache_files)
+                artifact = self.artifact_path(p_settings)
+                size = self.artifact_size(artifact if p_settings.get('one_file', True) else artifact.parent) if success else None
+                self.history.record(p_settings.get('history_kind', 'exe'), p_settings.get('exe_name', 'MyApp'), BuildHistory.settings_hash(p_settings), start_time, time.time() - start_time, phases,
+                                    size, result.get('returncode'), success, result.get('cpu_time'), result.get('peak_rss'))
+            except Exception as e:
+                self.logger.warning(f"Could not record build statistics: {e}")
+            finally:
+                if on_complete:
+                    on_complete(success)
+
+class TolerantModuleFinder(ModuleFinder):
+    """ModuleFinder that skips modules it can't resolve (e.g. namespace packages such as setuptools._vendor) instead of aborting."""
+    def find_module(self, name, path, parent=None):
+        try:
+            return super().find_module(name, path, parent)
+        except ImportError:
+            raise
+        except Exception as e:
+            raise ImportError(f"{name}: {e}") from e
+
+class ImportTracer:
+    """Runs the entry script (or a test command) in build_env with an audit hook and derives pruning settings."""
+    def __init__(self, logger, env_manager, build_orchestrator):
+        self.logger = logger
+        self.env_manager = env_manager
+        self.build_orchestrator = build_orchestrator
+
+    def trace(self, project_settings, on_complete=None):
+        thread = threading.Thread(target=self._trace_in_background, args=(project_settings, on_complete), daemon=True)
+        thread.start()
+        return thread
+
+    def _trace_in_background(self, p_settings, on_complete=None):
+        result = None
+        try:
+            if not p_settings.get('script_path') or not Path(p_settings['script_path']).exists():
+                raise RuntimeError("Python script not specified or not found.")
+            trace = self._run_traced(p_settings)
+            result = self.derive_settings(p_settings, trace)
+            self.logger.info("✅ Trace complete: %d modules loaded, %d excludes suggested, %d data paths needed.",
+                             len(trace['modules']), len(result['exclude_modules']), len(result['data_paths']))
+            if p_settings.get('trace_compare'):
+                self._compare_builds(p_settings, result)
+        except Exception as e:
+            self.logger.error(f"❌ Import trace failed: {e}")
+            result = None
+        finally:
+            if on_complete: on_complete(result)
+
+    def _run_traced(self, p_settings):
+        script = Path(p_settings['script_path']).resolve()
+        with tempfile.TemporaryDirectory(prefix="py2win_trace_") as trace_dir:
+            (Path(trace_dir) / "sitecustomize.py").write_text(TRACE_BOOTSTRAP, encoding="utf-8")
+            env = dict(os.environ, PY2WIN_TRACE_DIR=trace_dir)
+            env.pop("PY2WIN_TRACE_SECONDS", None)
+            env["PYTHONPATH"] = os.pathsep.join(filter(None, [trace_dir, env.get("PYTHONPATH")]))
+            env["PATH"] = os.pathsep.join([str(self.env_manager.python_executable.parent.resolve()), env.get("PATH", "")])
+            if command := p_settings.get('trace_command'):
+                # Test commands run to completion; a time limit would silently truncate them.
+                self.logger.info("Tracing test command: %s", command)
+                args, shell, timeout = command, True, None
+            else:
+                self.logger.info("Tracing %s for up to %d seconds...", script.name, TRACE_TIMEOUT)
+                env["PY2WIN_TRACE_SECONDS"] = str(TRACE_TIMEOUT)
+                args, shell, timeout = [str(self.env_manager.python_executable.resolve()), str(script)], False, TRACE_TIMEOUT + 30
+            process = subprocess.Popen(args, shell=shell, cwd=script.parent, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+            try: process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill(); process.wait()
+            if command and process.returncode != 0:
+                self.logger.warning("Trace command exited with status %s; the trace may be incomplete.", process.returncode)
+            traces = [json.loads(f.read_text(encoding="utf-8")) for f in Path(trace_dir).glob("trace-*.json")]
+            if not traces:
+                raise RuntimeError(f"No trace was recorded (exit code {process.returncode}).")
+            trace_root = Path(trace_dir).resolve()
+            return {"modules": sorted({m for t in traces for m in t['modules']}),
+                    "files": sorted({f for t in traces for f in t['files'] if trace_root not in Path(f).parents})}
+
+    def _static_modules(self, script):
+        """Top-level modules PyInstaller's static analysis would pull in, resolved against build_env's sys.path."""
+        venv_path = json.loads(subprocess.run([str(self.env_manager.python_executable), "-c", "import sys, json; print(json.dumps(sys.path))"],
+                                              check=True, capture_output=True, text=True, creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)).stdout)
+        finder = TolerantModuleFinder(path=[str(Path(script).parent)] + venv_path)
+        finder.run_script(str(script))
+        return {name.split('.')[0] for name in finder.modules}
+
+    def derive_settings(self, p_settings, trace):
+        script = Path(p_settings['script_path']).resolve()
+        loaded = {name.split('.')[0] for name in trace['modules']}
+        keep = loaded | TRACE_KEEP_MODULES | {h.split('.')[0] for h in p_settings.get('hidden_imports', [])} | {"__main__", script.stem}
+        excludes = sorted(set(p_settings.get('exclude_modules', [])) | (self._static_modules(script) - keep - set(sys.builtin_module_names)))
+        venv_root = self.env_manager.venv_dir.resolve()
+        read_files = [Path(f) for f in trace['files'] if Path(f).is_file() and Path(f).suffix.lower() not in (".py", ".pyc", ".pyd", ".so", ".dll")]
+        read_files = [f for f in read_files if venv_root not in f.parents]
+        data_paths, covered = [], set()
+        for entry in p_settings.get('data_paths', []):
+            root = Path(entry).resolve()
+            hits = {f for f in read_files if f == root or root in f.parents}
+            if hits: data_paths.append(entry); covered |= hits
+            else: self.logger.info("Data path never read during trace, dropping: %s", entry)
+        for f in read_files:
+            if f not in covered and script.parent in f.parents:
+                data_paths.append(str(f))
+        return {"exclude_modules": excludes, "data_paths": data_paths}
+
+    def _compare_builds(self, p_settings, pruned):
+        rows = []
+        for label, overrides in (("before", {}), ("after", pruned)):
+            # Throwaway dist, work and spec folders so the project's own build cache and output stay untouched.
+            temp_root = Path(tempfile.mkdtemp(prefix=f"py2win_trace_{label}_"))
+            try:
+                settings = dict(p_settings, **overrides, output_dir=str(temp_root / "dist"), work_dir=str(temp_root / "build"),
+                                spec_dir=str(temp_root / "build"), clean_build=False, history_kind="trace")
+                status = []
+                self.logger.info("Comparison build (%s pruning)...", label)
+                self.build_orchestrator._build_in_background(settings, status.append)
+                exe = BuildOrchestrator.artifact_path(settings)
+                if not (status and status[0] and exe.exists()):
+                    self.logger.error("❌ Comparison build (%s pruning) failed.", label)
+                    return
+                rows.append((label, BuildOrchestrator.artifact_size(exe.parent if not settings.get('one_file', True) else exe), BuildOrchestrator.measure_startup(exe)))
+            finally:
+                shutil.rmtree(temp_root, ignore_errors=True)
+        for label, size, startup in rows:
+            self.logger.info("  %-6s  size: %8.1f MB  startup: %s", label, size / 1e6, f"{startup:.2f} s" if startup is not None else "still running (GUI?)")
+
+class BuildMatrix:
+    """Builds each project once per discovered Python interpreter, each in its own cached venv."""
+    def __init__(self, logger):
+        self.logger = logger
+
+    def run(self, projects, on_complete=None):
+        thread = threading.Thread(target=self._run_in_background, args=(projects, on_complete), daemon=True)
+        thread.start()
+        return thread
+
+    @staticmethod
+    def _env_for(version, interpreter, logger):
+        tag = f"py{version[0]}{version[1]}"
+        # The interpreter Py2Win itself runs on keeps using the regular build_env cache.
+        same = os.path.realpath(interpreter) == os.path.realpath(sys.executable)
+        return tag, EnvManager(logger, interpreter, VENV_DIR if same else VENV_DIR.with_name(f"{VENV_DIR.name}_{tag}"))
+
+    def _provision(self, tag, env_manager):
+        status = []
+        env_manager._validate_in_background(status.append)
+        if not (status and status[0]): self.logger.error("❌ [%s] Environment provisioning failed; skipping.", tag)
+        return bool(status and status[0])
+
+    def _build_all(self, tag, env_manager, projects):
+        orchestrator, rows = BuildOrchestrator(self.logger, env_manager), []
+        for p_settings in projects:
+            # Per-project folders, so clean_build only wipes this project's previous output for this interpreter.
+            name = p_settings.get('exe_name', 'MyApp')
+            work_dir = str(Path('./build') / tag / name)
+            settings = dict(p_settings, output_dir=str(Path(p_settings.get('output_dir') or './dist') / tag / name), work_dir=work_dir, spec_dir=work_dir)
+            status, start = [], time.perf_counter()
+            orchestrator._build_in_background(settings, status.append)
+            duration = time.perf_counter() - start
+            exe = BuildOrchestrator.artifact_path(settings)
+            if status and status[0] and exe.exists():
+                size = BuildOrchestrator.artifact_size(exe if settings.get('one_file', True) else exe.parent)
+                rows.append((tag, settings.get('exe_name', 'MyApp'), duration, size, BuildOrchestrator.measure_startup(exe)))
+            else:
+                rows.append((tag, settings.get('exe_name', 'MyApp'), duration, None, None))
+        return rows
+
+    def _run_in_background(self, projects, on_complete=None):
+        rows = []
+        try:
+            interpreters = EnvManager.discover_interpreters()
+            if not interpreters: raise RuntimeError("No CPython 3 interpreters found.")
+            self.logger.info("Build matrix: %s", ", ".join(f"{v[0]}.{v[1]} ({p})" for v, p in interpreters.items()))
+            envs = dict(self._env_for(v, p, self.logger) for v, p in interpreters.items())
+            with ThreadPoolExecutor(max_workers=len(envs)) as pool:
+                provisioned = dict(zip(envs, pool.map(lambda item: self._provision(*item), envs.items())))
+            # Builds run one at a time so build times and startup latency aren't measured under CPU contention.
+            for tag, env in envs.items():
+                if provisioned[tag]: rows += self._build_all(tag, env, projects)
+            self.logger.info("%s", self.format_table(rows))
+        except Exception as e:
+            self.logger.error(f"❌ Build matrix failed: {e}")
+        finally:
+            if on_complete: on_complete(rows)
+
+    @staticmethod
+    def format_table(rows):
+        lines = [f"{'Python':<8}{'Project':<24}{'Build (s)':>11}{'Size (MB)':>11}{'Startup (s)':>13}", "-" * 67]
+        for tag, name, duration, size, startup in rows:
+            size_col = f"{size / 1e6:.1f}" if size is not None else "failed"
+            startup_col = f"{startup:.2f}" if startup is not None else ("n/a" if size is None else "GUI/timeout")
+            lines.append(f"{tag:<8}{name[:23]:<24}{duration:>11.1f}{size_col:>11}{startup_col:>13}")
+        return "Build matrix results:\n" + "\n".join(lines)
+
+class BinaryDeduplicator:
+    """Hard-links identical files across several onedir dist trees into a shared runtime store."""
+    def __init__(self, logger):
+        self.logger = logger
+
+    @staticmethod
+    def app_dirs(dist_root):
+        dist_root = Path(dist_root)
+        if not dist_root.is_dir(): return []
+        return sorted(d for d in dist_root.iterdir() if d.is_dir() and d.name != SHARED_RUNTIME_DIRNAME)
+
+    def _hash_file(self, path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(DEDUP_CHUNK_SIZE), b''): digest.update(chunk)
+        return digest.hexdigest()
+
+    def find_duplicates(self, dist_dirs):
+        """Returns {(size, sha256): [paths]} for every file present more than once across dist_dirs."""
+        by_size = {}
+        for root in dist_dirs:
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = [d for d in dirnames if d != SHARED_RUNTIME_DIRNAME]
+                for name in filenames:
+                    path = Path(dirpath) / name
+                    try: size = path.stat().st_size
+                    except OSError: continue
+                    if size >= DEDUP_MIN_SIZE: by_size.setdefault(size, []).append(path)
+        groups = {}
+        # Only files sharing a size can be identical, so most of the tree is never hashed.
+        for size, paths in by_size.items():
+            if len(paths) < 2: continue
+            for path in paths: groups.setdefault((size, self._hash_file(path)), []).append(path)
+        return {key: paths for key, paths in groups.items() if len(paths) > 1}
+
+    @staticmethod
+    def saved_bytes(groups):
+        return sum(size * (len(paths) - 1) for (size, _), paths in groups.items())
+
+    def _link_into_store(self, store_path, path):
+        if store_path.exists() and os.path.samefile(store_path, path): return False
+        tmp_path = path.with_name(path.name + ".py2win-link")
+        if tmp_path.exists(): tmp_path.unlink()
+        os.link(store_path, tmp_path)
+        os.replace(tmp_path, path)
+        return True
+
+    def _prune_store(self, store):
+        # Entries only referenced by the store itself belong to apps that were rebuilt or removed.
+        for path in [p for p in store.rglob("*") if p.is_file() and p.stat().st_nlink == 1]: path.unlink()
+        for path in sorted((p for p in store.rglob("*") if p.is_dir()), reverse=True):
+            if not any(path.iterdir()): path.rmdir()
+
+    def dedupe(self, *dist_roots):
+        """Links duplicates across the app folders of every dist root; the store lives in the first (all must share a volume)."""
+        roots = [Path(r) for r in dist_roots]
+        dist_dirs = sorted({d.resolve() for root in roots for d in self.app_dirs(root)})
+        if len(dist_dirs) < 2:
+            self.logger.info("Deduplication skipped: fewer than two app folders in %s.", ", ".join(map(str, roots)))
+            return None
+        self.logger.info("🔗 Deduplicating binaries across %d app folders in %d dist folder(s)...", len(dist_dirs), len(roots))
+        store = roots[0] / SHARED_RUNTIME_DIRNAME
+        if store.is_dir(): self._prune_store(store)
+        groups = self.find_duplicates(dist_dirs)
+        linked = 0
+        try:
+            for (size, digest), paths in groups.items():
+                store_path = store / digest[:16] / paths[0].name
+                if not store_path.exists():
+                    store_path.parent.mkdir(parents=True, exist_ok=True)
+                    os.link(paths[0], store_path)
+                linked += sum(self._link_into_store(store_path, path) for path in paths)
+        except OSError as e:
+            self.logger.error(f"❌ Hard-linking failed (the output filesystem may not support hard links): {e}")
+            return None
+        saved = self.saved_bytes(groups)
+        self.logger.info("✅ Deduplicated %d files in %d groups (%d newly linked). Disk space saved: %.1f MB.",
+                         sum(len(p) for p in groups.values()), len(groups), linked, saved / 1e6)
+        return {"groups": len(groups), "linked": linked, "saved_bytes": saved}
 
 class InstallerMaker:
     def __init__(self, logger):
@@ -211,8 +1102,9 @@ class InstallerMaker:
         return thread
 
 class NSISProvider:
-    def __init__(self, logger):
+    def __init__(self, logger, history=None):
         self.logger = logger
+        self.history = history or BuildHistory(logger)
     def _check_nsis(self):
         if NSIS_EXE_PATH.is_file():
             if sys.platform != "win32" and not os.access(NSIS_EXE_PATH, os.X_OK):
@@ -243,9 +1135,13 @@ class NSISProvider:
     def build(self, i_settings, p_settings, s_settings, on_complete=None):
         self.logger.info("Starting NSIS installer build...")
         success = False
+        start_time = time.time()
+        result, output_exe_path = {}, None
+        phases, mark = BuildHistory.phase_clock()
         try:
             if not self._check_nsis():
                 return
+            mark("nsis_setup")
             dist_dir = Path(p_settings.get('output_dir', './dist'))
             if not dist_dir.exists() or not any(dist_dir.iterdir()):
                 self.logger.error("❌ Dist directory is empty. Build the application first.")
@@ -255,21 +1151,51 @@ class NSISProvider:
             nsi_file = Path("./installer.nsi")
             nsi_file.write_text(nsi_script, encoding='utf-8')
             self.logger.info("Generated .nsi script.")
+            mark("script")
             cmd = [str(NSIS_EXE_PATH), str(nsi_file)]
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding='utf-8', creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
-            for line in iter(process.stdout.readline, ''):
-                self.logger.info(line.strip())
-            if process.wait() == 0:
+            result = ProcessRunner(self.logger).run(cmd, timeout=NSIS_TIMEOUT, label="makensis")
+            mark("makensis")
+            if result['returncode'] == 0:
                 self.logger.info(f"✅ NSIS installer built successfully: {html.escape(str(output_exe_path))}")
+                if i_settings.get('shared_runtime') and i_settings.get('measure_layout'):  # Opt-in: compiles a second installer
+                    self._measure_layout_savings(i_settings, p_settings, dist_dir, output_exe_path)
+                    mark("layout_reference")
                 self._sign_installer(output_exe_path, s_settings)
+                mark("sign")
                 success = True
             else:
                 self.logger.error("❌ NSIS build failed.")
         except Exception as e:
             self.logger.error(f"❌ An unexpected error occurred during installer build: {e}")
         finally:
-            if on_complete:
-                on_complete(success)
+            try:  # Bookkeeping must never swallow the completion callback
+                size = output_exe_path.stat().st_size if success and output_exe_path.is_file() else None
+                # The optional reference installer is a measurement, not part of producing this one.
+                duration = time.time() - start_time - phases.get("layout_reference", 0.0)
+                self.history.record("installer", i_settings.get('app_name', 'MyApp'), BuildHistory.settings_hash(i_settings, p_settings, s_settings), start_time, duration, phases,
+                                    size, result.get('returncode'), success, result.get('cpu_time'), result.get('peak_rss'))
+            except Exception as e:
+                self.logger.warning(f"Could not record build statistics: {e}")
+            finally:
+                if on_complete:
+                    on_complete(success)
+
+    def _measure_layout_savings(self, i_settings, p_settings, dist_dir, output_exe_path):
+        """Compiles a reference installer with the plain layout and logs the real compressed size difference."""
+        reference_exe = output_exe_path.with_name(f"{output_exe_path.stem}.reference.exe")
+        reference_nsi = Path("./installer_reference.nsi")
+        try:
+            reference_nsi.write_text(self._generate_nsi_script(dict(i_settings, shared_runtime=False), p_settings, dist_dir, reference_exe), encoding='utf-8')
+            self.logger.info("Building reference installer without the shared runtime layout to measure its effect...")
+            if ProcessRunner(self.logger).run([str(NSIS_EXE_PATH), str(reference_nsi)], timeout=NSIS_TIMEOUT, label="makensis (reference)")['returncode'] != 0:
+                self.logger.warning("Reference installer build failed; installer size reduction not measured.")
+                return
+            shared_size, plain_size = output_exe_path.stat().st_size, reference_exe.stat().st_size
+            self.logger.info("Installer size: %.1f MB with shared runtime layout vs %.1f MB without (%.1f MB, %.1f%% smaller).",
+                             shared_size / 1e6, plain_size / 1e6, (plain_size - shared_size) / 1e6, 100 * (plain_size - shared_size) / max(1, plain_size))
+        finally:
+            for path in (reference_exe, reference_nsi):
+                if path.exists(): path.unlink()
 
     def _get_output_path(self, i_settings):
         app_name = i_settings.get('app_name', 'MyApp')
@@ -293,6 +1219,44 @@ class NSISProvider:
         except subprocess.CalledProcessError as e:
             self.logger.error(f"❌ Code signing failed: {e.stderr}")
 
+    def _install_files_section(self, i_settings, dist_dir):
+        # The dedupe store only holds extra links to files already in the app folders; never pack it twice.
+        default = f'SetOutPath $INSTDIR; File /r /x {SHARED_RUNTIME_DIRNAME} "{dist_dir}\\*.*"'
+        if not i_settings.get('shared_runtime'):
+            return default
+        deduplicator = BinaryDeduplicator(self.logger)
+        groups = deduplicator.find_duplicates(deduplicator.app_dirs(dist_dir))
+        if not groups:
+            self.logger.info("Shared runtime layout: no duplicate binaries found, packaging dist as-is.")
+            return default
+        def win_rel(path):
+            rel = os.path.relpath(path, dist_dir)
+            return "" if rel == "." else "\\" + rel.replace("/", "\\")
+        shared = {path.resolve() for paths in groups.values() for path in paths}
+        lines, current_dir = [], None
+        for dirpath, dirnames, filenames in os.walk(dist_dir):
+            dirnames[:] = sorted(d for d in dirnames if d != SHARED_RUNTIME_DIRNAME)
+            for name in sorted(filenames):
+                path = Path(dirpath) / name
+                if path.resolve() in shared: continue
+                if dirpath != current_dir:
+                    lines.append(f'SetOutPath "$INSTDIR{win_rel(dirpath)}"')
+                    current_dir = dirpath
+                lines.append(f'File "{path.resolve()}"')
+        # Each duplicated binary is packed once, then hard-linked (or copied on non-NTFS volumes) into every app.
+        for (_, digest), paths in groups.items():
+            shared_file = f"$INSTDIR\\{SHARED_RUNTIME_DIRNAME}\\{digest[:16]}\\{paths[0].name}"
+            lines.append(f'SetOutPath "$INSTDIR\\{SHARED_RUNTIME_DIRNAME}\\{digest[:16]}"')
+            lines.append(f'File "{paths[0].resolve()}"')
+            for path in paths:
+                lines.append(f'CreateDirectory "$INSTDIR{win_rel(path.parent)}"')
+                lines.append(f'System::Call \'kernel32::CreateHardLinkW(w "$INSTDIR{win_rel(path)}", w "{shared_file}", p 0) i .r0\'')
+                lines.append('StrCmp $0 0 0 +2')
+                lines.append(f'CopyFiles /SILENT "{shared_file}" "$INSTDIR{win_rel(path)}"')
+        saved = deduplicator.saved_bytes(groups)
+        self.logger.info("Shared runtime layout: %d duplicated binaries packed once (%.1f MB less uncompressed payload, before NSIS compression).", len(groups), saved / 1e6)
+        return "\n  ".join(lines)
+
     def _generate_nsi_script(self, i_settings, p_settings, dist_dir, output_exe):
         exe_name = f"{p_settings.get('exe_name', 'MyApp')}.exe"
         script = f"""
@@ -306,7 +1270,7 @@ RequestExecutionLevel admin
 VIAddVersionKey "ProductName" "${{APPNAME}}"; VIAddVersionKey "ProductVersion" "${{VERSION}}"
 Page directory; Page instfiles; UninstPage uninstConfirm
 Section "Install"
-  SetOutPath $INSTDIR; File /r "{dist_dir}\\*.*"
+  {self._install_files_section(i_settings, dist_dir)}
   WriteRegStr HKLM "Software\\Microsoft\\Windows\\CurrentVersion\\Uninstall\\${{APPNAME}}" "DisplayName" "${{APPNAME}}"
   WriteRegStr HKLM "Software\\Microsoft\\Windows\\CurrentVersion\\Uninstall\\${{APPNAME}}" "UninstallString" '"$INSTDIR\\uninstall.exe"'
   WriteUninstaller "$INSTDIR\\uninstall.exe"
@@ -378,6 +1342,8 @@ class Py2WinPremiumApp(customtkinter.CTk):
         self.env_manager = EnvManager(self.logger)
         self.build_orchestrator = BuildOrchestrator(self.logger, self.env_manager)
         self.installer_maker = InstallerMaker(self.logger)
+        self.import_tracer = ImportTracer(self.logger, self.env_manager, self.build_orchestrator)
+        self.build_matrix = BuildMatrix(self.logger)
         # Finalize
         self.load_default_project()
 
@@ -394,13 +1360,15 @@ class Py2WinPremiumApp(customtkinter.CTk):
         self.after(100, self._poll_log_queue)
 
     def _poll_log_queue(self):
+        records = []
         try:
-            while True:
-                record = self.log_queue.get(block=False)
-                self.console.insert("end", record + "\n")
-                self.console.see("end")
+            while len(records) < LOG_POLL_BATCH:
+                records.append(self.log_queue.get(block=False))
         except queue.Empty:
             pass
+        if records:
+            self.console.insert("end", "\n".join(records) + "\n")
+            self.console.see("end")
         self.after(100, self._poll_log_queue)
 
     def create_widgets(self):
@@ -416,17 +1384,21 @@ class Py2WinPremiumApp(customtkinter.CTk):
         self.ai_btn.grid(row=2, column=0, padx=20, pady=10)
         self.update_btn = customtkinter.CTkButton(self.sidebar_frame, text="Check for Updates", command=self.check_for_updates)
         self.update_btn.grid(row=3, column=0, padx=20, pady=10)
+        self.matrix_btn = customtkinter.CTkButton(self.sidebar_frame, text="Build Matrix", command=self.start_matrix_build)
+        self.matrix_btn.grid(row=4, column=0, padx=20, pady=10)
+        Tooltip(self.matrix_btn, "Builds the project (plus any extra scripts you pick) with every installed Python version and compares build time, size and startup.")
         self.main_frame = customtkinter.CTkFrame(self)
         self.main_frame.grid(row=0, column=1, sticky="nsew", padx=10, pady=10)
         self.tab_view = customtkinter.CTkTabview(self.main_frame)
         self.tab_view.pack(expand=True, fill="both", padx=5, pady=5)
-        tabs = ["Build", "Advanced", "Branding", "Installer", "Security"]
+        tabs = ["Build", "Advanced", "Branding", "Installer", "Security", "History"]
         [self.tab_view.add(t) for t in tabs]
         self.create_build_tab(self.tab_view.tab("Build"))
         self.create_advanced_tab(self.tab_view.tab("Advanced"))
         self.create_branding_tab(self.tab_view.tab("Branding"))
         self.create_installer_tab(self.tab_view.tab("Installer"))
         self.create_security_tab(self.tab_view.tab("Security"))
+        self.create_history_tab(self.tab_view.tab("History"))
         self.console_frame = customtkinter.CTkFrame(self)
         self.console_frame.grid(row=1, column=1, sticky="nsew", padx=10, pady=(0,10))
         self.console_frame.grid_columnconfigure(0, weight=1)
@@ -466,6 +1438,9 @@ class Py2WinPremiumApp(customtkinter.CTk):
         Tooltip(wc, "For GUI applications. Hides the black console window.")
         self.build_button = customtkinter.CTkButton(tab, text="Build Executable", height=40, font=("", 16, "bold"), command=self.start_build)
         self.build_button.grid(row=5, column=0, columnspan=4, padx=20, pady=20, sticky="ew")
+        self.watch_button = customtkinter.CTkButton(tab, text="Watch & Rebuild", command=self.toggle_watch)
+        self.watch_button.grid(row=6, column=0, columnspan=4, padx=20, pady=(0, 20), sticky="ew")
+        Tooltip(self.watch_button, "Rebuilds incrementally whenever the script, its local imports, data files or icon are saved.")
 
     def create_advanced_tab(self, tab):
         tab.grid_columnconfigure(0, weight=1)
@@ -481,6 +1456,17 @@ class Py2WinPremiumApp(customtkinter.CTk):
         upx_cb = customtkinter.CTkCheckBox(options_frame, text="Use UPX compression", variable=self.use_upx_var, onvalue="on", offvalue="off")
         upx_cb.grid(row=0, column=1, padx=10, pady=10, sticky="w")
         Tooltip(upx_cb, "Requires UPX in PATH. Reduces file size but may affect startup time.")
+        self.dedupe_var = customtkinter.StringVar(value="off")
+        dedupe_cb = customtkinter.CTkCheckBox(options_frame, text="Deduplicate binaries across apps", variable=self.dedupe_var, onvalue="on", offvalue="off")
+        dedupe_cb.grid(row=1, column=0, padx=10, pady=10, sticky="w")
+        self.bytecode_cache_var = customtkinter.StringVar(value="on")
+        bcc = customtkinter.CTkCheckBox(options_frame, text="Shared bytecode cache", variable=self.bytecode_cache_var, onvalue="on", offvalue="off")
+        bcc.grid(row=1, column=1, padx=10, pady=10, sticky="w")
+        Tooltip(bcc, "Reuses compiled modules across all projects built with the same interpreter instead of recompiling them every build.")
+        Tooltip(dedupe_cb, "One-folder builds only. Hard-links identical DLLs and extensions shared by the app folders in the output directory. With 'Clean Build' on, only this app's own folder is cleaned.")
+        dedupe_btn = customtkinter.CTkButton(options_frame, text="Deduplicate Dist Folders...", command=self.start_dedupe)
+        dedupe_btn.grid(row=2, column=0, padx=10, pady=10, sticky="w")
+        Tooltip(dedupe_btn, "Hard-links identical binaries across existing dist folders without building. Pick folders one at a time and cancel when done; they must be on the same drive.")
         hid_frame = customtkinter.CTkFrame(tab)
         hid_frame.grid(row=1, column=0, padx=10, pady=6, sticky="ew")
         hid_frame.grid_columnconfigure(1, weight=1)
@@ -515,6 +1501,19 @@ class Py2WinPremiumApp(customtkinter.CTk):
         customtkinter.CTkButton(btns, text="Add File(s)", command=self._add_data_files).grid(row=0, column=0, padx=5, pady=5)
         customtkinter.CTkButton(btns, text="Add Folder", command=self._add_data_folder).grid(row=1, column=0, padx=5, pady=5)
         customtkinter.CTkButton(btns, text="Remove", command=self._remove_selected_data).grid(row=2, column=0, padx=5, pady=5)
+        trace_frame = customtkinter.CTkFrame(tab)
+        trace_frame.grid(row=4, column=0, padx=10, pady=6, sticky="ew")
+        trace_frame.grid_columnconfigure(1, weight=1)
+        customtkinter.CTkLabel(trace_frame, text="Trace Command:").grid(row=0, column=0, padx=10, pady=8, sticky="w")
+        self.trace_command_entry = customtkinter.CTkEntry(trace_frame, placeholder_text="optional, e.g. python -m pytest tests")
+        self.trace_command_entry.grid(row=0, column=1, padx=6, pady=8, sticky="ew")
+        Tooltip(self.trace_command_entry, "Command run inside build_env while recording imports and file reads. Leave empty to run the script itself.")
+        self.trace_compare_var = customtkinter.StringVar(value="off")
+        tcc = customtkinter.CTkCheckBox(trace_frame, text="Compare builds", variable=self.trace_compare_var, onvalue="on", offvalue="off")
+        tcc.grid(row=0, column=2, padx=6, pady=8)
+        Tooltip(tcc, "Builds before and after pruning and reports bundle size and startup time. Takes two full builds.")
+        self.trace_button = customtkinter.CTkButton(trace_frame, text="Trace & Prune", width=120, command=self.start_trace)
+        self.trace_button.grid(row=0, column=3, padx=6, pady=8)
 
     def create_branding_tab(self, tab):
         tab.grid_columnconfigure(1, weight=1)
@@ -565,6 +1564,14 @@ class Py2WinPremiumApp(customtkinter.CTk):
         smc = customtkinter.CTkCheckBox(options_frame, text="Start Menu Shortcut", variable=self.start_menu_var, onvalue="on", offvalue="off")
         smc.pack(side="left", padx=10)
         Tooltip(smc, "Create a shortcut in the Windows Start Menu.")
+        self.shared_runtime_var = customtkinter.StringVar(value="off")
+        src = customtkinter.CTkCheckBox(options_frame, text="Shared Runtime Layout", variable=self.shared_runtime_var, onvalue="on", offvalue="off")
+        src.pack(side="left", padx=10)
+        Tooltip(src, "Packs binaries duplicated across app folders once and hard-links them at install time.")
+        self.measure_layout_var = customtkinter.StringVar(value="off")
+        mlc = customtkinter.CTkCheckBox(options_frame, text="Measure Size Savings", variable=self.measure_layout_var, onvalue="on", offvalue="off")
+        mlc.pack(side="left", padx=10)
+        Tooltip(mlc, "With Shared Runtime Layout: also compiles a plain installer once to report the real size difference. Roughly doubles installer build time.")
         self.installer_button = customtkinter.CTkButton(tab, text="Build NSIS Installer", command=self.build_nsis_installer)
         self.installer_button.grid(row=5, column=0, columnspan=2, padx=10, pady=20, sticky="ew")
 
@@ -586,6 +1593,33 @@ class Py2WinPremiumApp(customtkinter.CTk):
         self.cert_pass_entry.grid(row=3, column=1, padx=10, pady=6, sticky="ew")
         Tooltip(self.cert_pass_entry, "The password for your certificate file.")
 
+    def create_history_tab(self, tab):
+        tab.grid_columnconfigure(0, weight=1)
+        tab.grid_rowconfigure(1, weight=1)
+        controls = customtkinter.CTkFrame(tab, fg_color="transparent")
+        controls.grid(row=0, column=0, padx=10, pady=10, sticky="ew")
+        customtkinter.CTkLabel(controls, text="Days:").pack(side="left", padx=(0, 6))
+        self.history_days_entry = customtkinter.CTkEntry(controls, width=60)
+        self.history_days_entry.insert(0, "30")
+        self.history_days_entry.pack(side="left")
+        Tooltip(self.history_days_entry, "How many days of daily trends to show.")
+        customtkinter.CTkButton(controls, text="Refresh", width=100, command=self.refresh_history).pack(side="left", padx=10)
+        self.history_box = customtkinter.CTkTextbox(tab, wrap="none", font=("Consolas", 12))
+        self.history_box.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="nsew")
+        self.refresh_history()
+
+    def refresh_history(self):
+        days = self.history_days_entry.get().strip() or "30"
+        if not days.isdigit() or int(days) < 1:
+            text = "Days must be a positive whole number."
+        else:
+            try:
+                text = BuildHistory(self.logger).report(days=int(days))
+            except (sqlite3.Error, OSError) as e:
+                text = f"Could not load build history: {e}"
+        self.history_box.delete("1.0", "end")
+        self.history_box.insert("end", text)
+
     def _add_hidden(self):
         m = self.hidden_entry.get().strip()
         if m:
@@ -644,6 +1678,8 @@ class Py2WinPremiumApp(customtkinter.CTk):
         state = "disabled" if is_building else "normal"
         self.build_button.configure(state=state)
         self.installer_button.configure(state=state)
+        self.trace_button.configure(state=state)
+        self.matrix_btn.configure(state=state)
 
     def start_build(self):
         if not self.is_env_valid:
@@ -659,6 +1695,69 @@ class Py2WinPremiumApp(customtkinter.CTk):
         if success:
              messagebox.showinfo("Build Complete", "Executable build has finished successfully.")
 
+    def start_matrix_build(self):
+        settings = self.gather_project_settings()
+        if not settings['script_path'] or not Path(settings['script_path']).exists():
+            messagebox.showerror("Script Not Found", "Please select a valid Python script first.")
+            return
+        # Extra entry scripts are built with the same options (minus this project's data files) to compare several apps at once.
+        extra = filedialog.askopenfilenames(title="Additional scripts for the matrix (Cancel to build only this project)", filetypes=[("Python Files", "*.py *.pyw")])
+        projects = [settings] + [dict(settings, script_path=p, exe_name=Path(p).stem, data_paths=[]) for p in extra if os.path.abspath(p) != os.path.abspath(settings['script_path'])]
+        self._toggle_build_buttons(is_building=True)
+        self.update_status("Running build matrix...", 0.1)
+        self.build_matrix.run(projects, lambda rows: self.after(0, self._on_matrix_complete, rows))
+
+    def _on_matrix_complete(self, rows):
+        self._toggle_build_buttons(is_building=False)
+        ok = any(size is not None for _, _, _, size, _ in rows)
+        self.update_status("Build matrix complete." if ok else "Build matrix failed.", 1.0)
+
+    def toggle_watch(self):
+        if self.build_orchestrator.is_watching:
+            self.build_orchestrator.stop_watch()
+            self.watch_button.configure(text="Watch & Rebuild")
+            self._toggle_build_buttons(is_building=False)
+            self.update_status("Ready", 0)
+            return
+        if not self.is_env_valid:
+            messagebox.showerror("Environment Invalid", "Please validate the environment before watching.")
+            return
+        settings = self.gather_project_settings()
+        if not settings['script_path'] or not Path(settings['script_path']).exists():
+            messagebox.showerror("Script Not Found", "Please select a valid Python script first.")
+            return
+        self._toggle_build_buttons(is_building=True)
+        self.watch_button.configure(text="Stop Watching")
+        self.update_status("Watching for changes...", 0)
+        self.build_orchestrator.watch(settings, lambda s: self.after(0, self.update_status, "Rebuilt, watching..." if s else "Rebuild failed, watching...", 1.0))
+
+    def start_dedupe(self):
+        roots = []
+        while path := filedialog.askdirectory(title=f"Dist folder {len(roots) + 1} to deduplicate (Cancel when done)"):
+            if path not in roots: roots.append(path)
+        if not roots: return
+        threading.Thread(target=BinaryDeduplicator(self.logger).dedupe, args=roots, daemon=True).start()
+
+    def start_trace(self):
+        if not self.is_env_valid:
+            messagebox.showerror("Environment Invalid", "Please validate the environment before tracing.")
+            return
+        self._toggle_build_buttons(is_building=True)
+        self.update_status("Tracing imports...", 0.1)
+        self.import_tracer.trace(self.gather_project_settings(), lambda r: self.after(0, self._on_trace_complete, r))
+
+    def _on_trace_complete(self, result):
+        self._toggle_build_buttons(is_building=False)
+        if result is None:
+            self.update_status("Trace failed.", 1.0)
+            return
+        self.exclude_list.delete(0, "end")
+        [self.exclude_list.insert("end", m) for m in result['exclude_modules']]
+        self.data_listbox.delete(0, "end")
+        self.data_paths = list(result['data_paths'])
+        [self.data_listbox.insert("end", f"{'DIR: ' if os.path.isdir(p) else 'FILE:'} {p}") for p in self.data_paths]
+        self.update_status("Trace applied to build settings.", 1.0)
+
     def build_nsis_installer(self):
         if not self.is_env_valid:
             messagebox.showerror("Environment Invalid", "Please validate environment first.")
@@ -682,10 +1781,14 @@ class Py2WinPremiumApp(customtkinter.CTk):
             "windowed": self.windowed_var.get() == "on",
             "clean_build": self.clean_build_var.get() == "on",
             "use_upx": self.use_upx_var.get() == "on",
+            "dedupe_binaries": self.dedupe_var.get() == "on",
+            "bytecode_cache": self.bytecode_cache_var.get() == "on",
             "hidden_imports": list(self.hidden_list.get(0, "end")),
             "exclude_modules": list(self.exclude_list.get(0, "end")),
             "data_paths": self.data_paths,
-            "icon_path": self.icon_entry.get()
+            "icon_path": self.icon_entry.get(),
+            "trace_command": self.trace_command_entry.get(),
+            "trace_compare": self.trace_compare_var.get() == "on"
         }
         for key, entry in self.branding_entries.items():
             settings[key] = entry.get()
@@ -696,7 +1799,9 @@ class Py2WinPremiumApp(customtkinter.CTk):
             "version": self.inst_version.get() or "1.0.0",
             "output_dir": self.inst_output_dir.get(),
             "desktop_shortcut": self.desktop_shortcut_var.get() == "on",
-            "start_menu_shortcut": self.start_menu_var.get() == "on"
+            "start_menu_shortcut": self.start_menu_var.get() == "on",
+            "shared_runtime": self.shared_runtime_var.get() == "on",
+            "measure_layout": self.measure_layout_var.get() == "on"
         }
     def gather_security_settings(self):
         return {
@@ -730,7 +1835,19 @@ class Py2WinPremiumApp(customtkinter.CTk):
 if __name__ == "__main__":
     if not hasattr(subprocess, 'CREATE_NO_WINDOW'):
         subprocess.CREATE_NO_WINDOW = 0
-    if len(sys.argv) > 1 and sys.argv[1] == '--smoke-test':
+    if len(sys.argv) > 1 and sys.argv[1] == '--history':
+        days = sys.argv[2] if len(sys.argv) > 2 else "30"
+        if len(sys.argv) > 3 or not days.isdigit() or int(days) < 1:
+            print(f"Usage: {Path(sys.argv[0]).name} --history [days]  (days must be a positive integer, default 30)", file=sys.stderr)
+            sys.exit(2)
+        print(BuildHistory().report(days=int(days)))
+    elif len(sys.argv) > 1 and sys.argv[1] == '--dedupe':
+        if len(sys.argv) < 3:
+            print(f"Usage: {Path(sys.argv[0]).name} --dedupe DIST_DIR [DIST_DIR ...]  (folders of one-folder apps, on one volume)", file=sys.stderr)
+            sys.exit(2)
+        logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+        sys.exit(0 if BinaryDeduplicator(logging.getLogger('Dedupe')).dedupe(*sys.argv[2:]) else 1)
+    elif len(sys.argv) > 1 and sys.argv[1] == '--smoke-test':
         print("--- Running Headless End-to-End Smoke Test ---")
 
         # Setup simplified logging for the smoke test
@@ -764,8 +1881,16 @@ if __name__ == "__main__":
             if not (completed and validation_status and validation_status[0]):
                 logger.error("❌ Smoke Test Failed: Environment validation failed or timed out.")
                 sys.exit(1)
-            # 2. Build
+            # 2. Trace (the build_env ships setuptools, whose namespace packages used to break static analysis)
             build_orchestrator = BuildOrchestrator(logger, env_manager)
+            trace_app_path = Path("./smoke_trace_app.py")
+            trace_app_path.write_text("import os, json\nprint(os.getcwd(), json.dumps({}))")
+            trace_results = []
+            ImportTracer(logger, env_manager, build_orchestrator)._trace_in_background({"script_path": str(trace_app_path)}, trace_results.append)
+            if not (trace_results and trace_results[0] and "os" not in trace_results[0]["exclude_modules"]):
+                logger.error("❌ Smoke Test Failed: Import trace failed or excluded a module the script uses.")
+                sys.exit(1)
+            # 3. Build
             test_app_path = Path("./smoke_test_app.py")
             test_app_path.write_text("print('Hello from smoke test app!')")
             smoke_settings = {
@@ -782,7 +1907,7 @@ if __name__ == "__main__":
             if not (completed and build_status and build_status[0]):
                 logger.error("❌ Smoke Test Failed: Build process failed or timed out.")
                 sys.exit(1)
-            # 3. Installer
+            # 4. Installer
             if sys.platform == "win32":
                 installer_maker = InstallerMaker(logger)
                 installer_settings = {
@@ -799,7 +1924,7 @@ if __name__ == "__main__":
                     sys.exit(1)
             else:
                 logger.info("ℹ️ Skipping NSIS installer test on non-Windows platform.")
-            # 4. Verify
+            # 5. Verify
             exe_path = Path("./dist_smoke/SmokeTestApp.exe") if sys.platform == "win32" else Path("./dist_smoke/SmokeTestApp")
             installer_path = Path("./installers_smoke/Setup_SmokeTestApp_1.0.exe")
             exe_ok = exe_path.is_file()